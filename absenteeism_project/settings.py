@@ -86,6 +86,17 @@ DATABASES = {
     )
 }
 
+# One cache shared by every gunicorn worker, so the receivers in
+# tracker/signals.py invalidate cached aggregates for all of them (the
+# default LocMem cache is private to each process). The table is created
+# by tracker migration 0004 (or `python manage.py createcachetable`).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'tracker_cache',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
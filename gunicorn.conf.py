@@ -0,0 +1,13 @@
+# gunicorn.conf.py
+# Picked up automatically when gunicorn is started from the project root.
+
+# Load the Django app once in the master process so forked workers share
+# its memory copy-on-write instead of each building their own copy.
+preload_app = True
+
+
+def when_ready(server):
+    # Django only imports views on the first request, so import them here:
+    # the absence model in tracker/views.py is then loaded (and warmed up)
+    # once, before any worker is forked.
+    import tracker.views
\ No newline at end of file
@@ -10,18 +10,20 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'absenteeism_project.settings')
 django.setup()
 
 # 2. IMPORT YOUR MODELS
+from django.db import transaction
 from tracker.models import AbsenceReason, Employee
 
 # 3. DEFINE YOUR DATA AND MAPPINGS
 try:
     # --- IMPORTANT: Make sure this path is correct ---
     DATASET_PATH = 'Absenteeism_at_work.csv' 
-    df = pd.read_csv(DATASET_PATH, sep=';')
-    print(f"--- Successfully loaded DataFrame from {DATASET_PATH} ---")
+    # Only the header is read here; the data itself is loaded after validation
+    csv_columns = pd.read_csv(DATASET_PATH, sep=';', nrows=0).columns.to_list()
+    print(f"--- Successfully read header from {DATASET_PATH} ---")
 
     # --- NEW DEBUG STEP 1: Print all columns from your CSV ---
     print("\n--- DataFrame Columns (from your CSV file) ---")
-    print(df.columns.to_list())
+    print(csv_columns)
     print("-------------------------------------------------\n")
 
 except FileNotFoundError:
@@ -65,17 +67,30 @@ COLUMN_MAP = {
     'Hit target': 'hit_target',
 }
 
+# Narrow dtypes for the mapped columns. Integer columns are small-ranged;
+# the two float columns stay float64 so stored values keep full precision.
+DTYPES = {
+    'ID': 'int32',
+    'Age': 'int8',
+    'Education': 'int8',
+    'Body mass index': 'float64',
+    'Transportation expense': 'int16',
+    'Distance from Residence to Work': 'int16',
+    'Service time': 'int8',
+    'Work load Average/day ': 'float64',
+    'Hit target': 'int8',
+}
+
 # --- NEW DEBUG STEP 2: Validate column map against the CSV ---
-csv_columns = df.columns.to_list()
 map_keys = list(COLUMN_MAP.keys())
 
-missing_keys = [key for key in map_keys if key not in csv_columns]
+missing_keys = set(map_keys) - set(csv_columns)
 
 if missing_keys:
     print(f"--- ERROR: SCRIPT STOPPED ---")
     print("Your CSV is missing columns that `COLUMN_MAP` needs.")
     print("Missing column(s):")
-    for key in missing_keys:
+    for key in sorted(missing_keys):
         print(f"  - '{key}'")
     
     print("\nACTION: Look at the 'DataFrame Columns' printout above.")
@@ -84,54 +99,66 @@ if missing_keys:
 else:
     print("--- Column map validated. All keys found in CSV. ---")
 
+# Rows parsed per chunk, so memory stays bounded however large the CSV is
+CHUNK_SIZE = 10_000
+
 
 # 4. DEFINE THE IMPORT FUNCTION
+# Runs as a single transaction: one commit for the whole import.
+@transaction.atomic
 def populate_database():
     
     print("\n--- Starting Data Import ---")
 
     # --- Step A: Populate AbsenceReason Table ---
     print("Populating AbsenceReason table...")
-    reasons_created_count = 0
-    for code, desc in REASON_MAP.items():
-        reason, created = AbsenceReason.objects.get_or_create(
-            reason_code=code,
-            defaults={'description': desc}
-        )
-        if created:
-            reasons_created_count += 1
+    reasons_before = AbsenceReason.objects.count()
+    AbsenceReason.objects.bulk_create(
+        [AbsenceReason(reason_code=code, description=desc) for code, desc in REASON_MAP.items()],
+        ignore_conflicts=True,
+    )
+    reasons_created_count = AbsenceReason.objects.count() - reasons_before
     print(f"Created {reasons_created_count} new absence reasons.")
 
     # --- Step B: Populate Employee Table ---
-    print("Processing unique employees from DataFrame...")
-    df_unique_employees = df.drop_duplicates(subset='ID', keep='last')
-    print(f"Found {len(df_unique_employees)} unique employees.")
-    
-    employees_created_count = 0
-    employees_updated_count = 0
-
-    for index, row in df_unique_employees.iterrows():
-        try:
-            employee_data = {}
-            for df_col, model_field in COLUMN_MAP.items():
-                employee_data[model_field] = row[df_col]
-
-            employee_data['full_name'] = f"Employee {row['ID']}"
-            employee_data['hourly_rate'] = 30.00 
-
-            employee, created = Employee.objects.update_or_create(
-                employee_id=row['ID'],  
-                defaults=employee_data     
-            )
-
-            if created:
-                employees_created_count += 1
-            else:
-                employees_updated_count += 1
-
-        except Exception as e:
-            # This will catch any other unexpected errors
-            print(f"  ERROR: Failed to import Employee {row['ID']}. Error: {e}")
+    print(f"Processing unique employees from {DATASET_PATH}...")
+    # Stream the CSV (only the columns COLUMN_MAP needs) and keep the last
+    # row seen per employee, keyed by ID.
+    latest_by_id = {}
+    for chunk in pd.read_csv(DATASET_PATH, sep=';', usecols=list(COLUMN_MAP),
+                             dtype=DTYPES, chunksize=CHUNK_SIZE):
+        # Rename CSV headers to model field names and add the derived
+        # columns in one vectorized pass, instead of building each row by hand.
+        chunk = chunk.drop_duplicates(subset='ID', keep='last').rename(columns=COLUMN_MAP)
+        chunk['full_name'] = 'Employee ' + chunk['employee_id'].astype(str)
+        chunk['hourly_rate'] = 30.00
+        for rec in chunk.to_dict(orient='records'):
+            latest_by_id[rec['employee_id']] = rec
+    print(f"Found {len(latest_by_id)} unique employees.")
+
+    employee_objs = [Employee(**rec) for rec in latest_by_id.values()]
+    update_fields = [
+        field for field in [*COLUMN_MAP.values(), 'full_name', 'hourly_rate']
+        if field != 'employee_id'
+    ]
+
+    existing_ids = set(
+        Employee.objects
+        .filter(employee_id__in=list(latest_by_id))
+        .values_list('employee_id', flat=True)
+    )
+
+    # One upsert per batch instead of a SELECT + INSERT/UPDATE per employee.
+    Employee.objects.bulk_create(
+        employee_objs,
+        update_conflicts=True,
+        update_fields=update_fields,
+        unique_fields=['employee_id'],
+        batch_size=500,
+    )
+
+    employees_updated_count = len(existing_ids)
+    employees_created_count = len(employee_objs) - employees_updated_count
 
     print("\n--- Import Complete ---")
     print(f"Created {employees_created_count} new employees.")
@@ -12,6 +12,7 @@ class AbsenceReasonAdmin(admin.ModelAdmin):
 class AbsenceLogAdmin(admin.ModelAdmin):
     list_display = ('employee', 'reason', 'predicted_hours', 'status', 'date_logged')
     list_filter = ('status', 'date_logged')
+    list_select_related = ('employee', 'reason')
 
 admin.site.register(Employee, EmployeeAdmin)
 admin.site.register(AbsenceReason, AbsenceReasonAdmin)
@@ -0,0 +1,103 @@
+# tracker/caching.py
+
+"""
+Cache keys, timeouts and loaders for data the views read on every page load.
+
+These values only change when the underlying rows are written, so they are
+cached briefly and dropped by the receivers in tracker/signals.py.
+"""
+
+from django.core.cache import cache
+from django.db.models import Sum
+
+from .models import AbsenceLog, AbsenceReason, Employee
+
+# Seconds a cached aggregate may be served before it is recomputed
+MONTHLY_HOURS_TIMEOUT = 60
+REASON_CHART_TIMEOUT = 60
+REASON_CHART_KEY = "tracker:reason_chart"
+
+# Employees and absence reasons change rarely (imports, admin edits)
+REFERENCE_TIMEOUT = 300
+EMPLOYEES_KEY = "tracker:employees"
+EMPLOYEE_COUNT_KEY = "tracker:employee_count"
+REASONS_KEY = "tracker:reasons"
+
+
+def monthly_hours_key(year, month):
+    """ Key for the {employee_id: absent hours} totals of one month. """
+    return f"tracker:monthly_hours:{year}-{month:02d}"
+
+
+def monthly_totals_key(year, month):
+    """ Key for the dashboard's total hours and compensation impact of one month. """
+    return f"tracker:monthly_totals:{year}-{month:02d}"
+
+
+def drop_absence_aggregates(months):
+    """ Drop the reason chart and the totals for each (year, month) given. """
+    keys = [REASON_CHART_KEY]
+    for year, month in months:
+        keys += [monthly_hours_key(year, month), monthly_totals_key(year, month)]
+    cache.delete_many(keys)
+
+
+def log_absences(entries):
+    """
+    Insert many AbsenceLog rows (dicts of field values) in batched INSERTs.
+    bulk_create does not send post_save, so the cached aggregates for the
+    affected months are dropped here instead of by tracker.signals.
+    """
+    logs = AbsenceLog.objects.bulk_create([AbsenceLog(**entry) for entry in entries], batch_size=500)
+    drop_absence_aggregates({(log.date_logged.year, log.date_logged.month) for log in logs})
+    return logs
+
+
+def get_all_employees():
+    """ Employees for the log-absence dropdown (id and name only). """
+    return cache.get_or_set(
+        EMPLOYEES_KEY,
+        lambda: list(Employee.objects.only('employee_id', 'full_name')),
+        REFERENCE_TIMEOUT,
+    )
+
+
+def get_employee_count():
+    """ Head count used for the dashboard absenteeism rate. """
+    return cache.get_or_set(EMPLOYEE_COUNT_KEY, Employee.objects.count, REFERENCE_TIMEOUT)
+
+
+def get_all_reasons():
+    """ All absence reasons, for the log-absence dropdown. """
+    return cache.get_or_set(
+        REASONS_KEY,
+        lambda: list(AbsenceReason.objects.all()),
+        REFERENCE_TIMEOUT,
+    )
+
+
+def get_reason_chart():
+    """
+    All-time predicted hours per absence reason, largest first, as
+    (reason_codes, labels, hours) lists for the dashboard chart.
+    """
+    return cache.get_or_set(REASON_CHART_KEY, _compute_reason_chart, REASON_CHART_TIMEOUT)
+
+
+def _compute_reason_chart():
+    # Group on the integer FK alone; descriptions come from the cached
+    # reason list instead of a join in the aggregate.
+    reason_rows = list(
+        AbsenceLog.objects
+        .values_list('reason_id')
+        .annotate(total_hours=Sum('predicted_hours'))
+        .filter(total_hours__gt=0)
+        .order_by('-total_hours')
+    )
+    if not reason_rows:
+        return [], [], []
+
+    descriptions = {reason.reason_code: reason.description for reason in get_all_reasons()}
+    reason_codes, chart_values = (list(col) for col in zip(*reason_rows))
+    chart_labels = [descriptions.get(code, str(code)) for code in reason_codes]
+    return reason_codes, chart_labels, chart_values
\ No newline at end of file
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-15 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='absencelog',
+            index=models.Index(fields=['employee', 'date_logged'], name='tracker_abs_employe_6a865b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='absencelog',
+            index=models.Index(fields=['status', 'date_logged'], name='tracker_abs_status_654d51_idx'),
+        ),
+    ]
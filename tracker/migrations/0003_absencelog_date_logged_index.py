@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-15 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0002_absencelog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='absencelog',
+            index=models.Index(fields=['date_logged'], name='tracker_abs_date_lo_a21ecd_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Creates the DatabaseCache table configured in settings.CACHES, so a plain
+# `migrate` on deploy is enough for the shared cache to work.
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0003_absencelog_date_logged_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
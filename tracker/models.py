@@ -51,5 +51,14 @@ class AbsenceLog(models.Model):
     predicted_hours = models.FloatField()  # <-- The model prediction is stored here
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='ABSENT')
 
+    class Meta:
+        # Monthly salary/KPI aggregates filter on a date_logged range (per
+        # employee for salaries), and the dashboard lists ABSENT logs newest first.
+        indexes = [
+            models.Index(fields=['date_logged']),
+            models.Index(fields=['employee', 'date_logged']),
+            models.Index(fields=['status', 'date_logged']),
+        ]
+
     def __str__(self):
         return f"{self.employee.full_name} - {self.reason.description}"
\ No newline at end of file
@@ -0,0 +1,50 @@
+# tracker/signals.py
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import (
+    EMPLOYEE_COUNT_KEY,
+    EMPLOYEES_KEY,
+    REASON_CHART_KEY,
+    REASONS_KEY,
+    drop_absence_aggregates,
+    monthly_totals_key,
+)
+from .models import AbsenceLog, AbsenceReason, Employee
+
+
+@receiver(pre_save, sender=AbsenceLog)
+def remember_stored_date_logged(sender, instance, **kwargs):
+    """ Keep the stored date_logged, so an edit that moves a log to another month also drops the old month. """
+    instance._stored_date_logged = None
+    if instance.pk is not None:
+        instance._stored_date_logged = (
+            AbsenceLog.objects.filter(pk=instance.pk).values_list('date_logged', flat=True).first()
+        )
+
+
+@receiver([post_save, post_delete], sender=AbsenceLog)
+def invalidate_absence_aggregates(sender, instance, **kwargs):
+    """ Drop the reason chart and the totals for this log's month (and its previous month, if moved). """
+    months = {(instance.date_logged.year, instance.date_logged.month)}
+    stored = getattr(instance, '_stored_date_logged', None)
+    if stored is not None:
+        months.add((stored.year, stored.month))
+    drop_absence_aggregates(months)
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_employees(sender, instance, **kwargs):
+    # The dashboard's compensation impact multiplies by hourly_rate, so the
+    # current month's cached totals go too (only that month is ever shown)
+    now = timezone.now()
+    cache.delete_many([EMPLOYEES_KEY, EMPLOYEE_COUNT_KEY, monthly_totals_key(now.year, now.month)])
+
+
+@receiver([post_save, post_delete], sender=AbsenceReason)
+def invalidate_reasons(sender, instance, **kwargs):
+    # The reason chart labels are resolved from the reason list as well
+    cache.delete_many([REASONS_KEY, REASON_CHART_KEY])
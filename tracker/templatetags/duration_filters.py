@@ -1,5 +1,4 @@
 from django import template
-import math
 
 register = template.Library()
 
@@ -12,12 +11,12 @@ def hours_to_duration(total_hours):
     if total_hours is None:
         return "0h 0m"
 
-    # math.modf splits the float into its fractional and integer parts
-    # e.g., 8.52 -> (0.52, 8.0)
-    frac_hours, int_hours = math.modf(float(total_hours))
+    # Work in whole minutes, rounded, so e.g. 8.52 -> 511 minutes
+    total_minutes = int(round(float(total_hours) * 60))
 
-    # Convert the fractional hour (0.52) into whole minutes
-    total_minutes = int(frac_hours * 60)
+    # divmod splits the minutes into hours and the leftover minutes
+    # e.g., 511 -> (8, 31)
+    hours, minutes = divmod(total_minutes, 60)
 
     # Return the formatted string
-    return f"{int(int_hours)}h {total_minutes}m"
\ No newline at end of file
+    return f"{hours}h {minutes}m"
\ No newline at end of file
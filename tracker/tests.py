@@ -1,3 +1,157 @@
+import datetime
+from unittest import skipIf
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .caching import log_absences, monthly_hours_key, monthly_totals_key
+from .models import AbsenceLog, AbsenceReason, Employee
+from .views import TO_BMI_MODEL, predict_batch
+
+
+def make_employee(employee_id):
+    return Employee.objects.create(
+        employee_id=employee_id,
+        full_name=f"Employee {employee_id}",
+        transportation_expense=200,
+        distance_from_residence_to_work=20,
+        service_time=10,
+        age=35,
+        work_load_average_day=250.0,
+        hit_target=95,
+        education=1,
+        body_mass_index=25.0,
+    )
+
+
+class DashboardQueryCountTests(TestCase):
+    """ Rendering the dashboard must not issue a query per absence row. """
+
+    def setUp(self):
+        self.reason = AbsenceReason.objects.create(reason_code=23, description="Medical consultation")
+
+    def count_dashboard_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_independent_of_absence_count(self):
+        AbsenceLog.objects.create(employee=make_employee(1), reason=self.reason, predicted_hours=4.0)
+        baseline = self.count_dashboard_queries()
+
+        for employee_id in range(2, 6):
+            AbsenceLog.objects.create(employee=make_employee(employee_id), reason=self.reason, predicted_hours=2.0)
+
+        self.assertEqual(self.count_dashboard_queries(), baseline)
+
+
+class DashboardCacheInvalidationTests(TestCase):
+    """ Cached dashboard KPIs must follow edits to the rows they are computed from. """
+
+    def setUp(self):
+        cache.clear()
+        self.reason = AbsenceReason.objects.create(reason_code=23, description="Medical consultation")
+
+    def test_hourly_rate_edit_refreshes_compensation_impact(self):
+        employee = make_employee(3)
+        AbsenceLog.objects.create(employee=employee, reason=self.reason, predicted_hours=4.0)
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['estimated_compensation_impact'], 120.0)
+
+        employee.hourly_rate = 100
+        employee.save()
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['estimated_compensation_impact'], 400.0)
+
+    def test_moving_a_log_drops_both_months(self):
+        log = AbsenceLog.objects.create(
+            employee=make_employee(1), reason=self.reason,
+            predicted_hours=4.0, date_logged=datetime.date(2024, 3, 5),
+        )
+        month_keys = [
+            monthly_hours_key(2024, 3), monthly_totals_key(2024, 3),
+            monthly_hours_key(2024, 4), monthly_totals_key(2024, 4),
+        ]
+        cache.set_many({key: "stale" for key in month_keys})
+
+        log.date_logged = datetime.date(2024, 4, 9)
+        log.save()
+
+        self.assertEqual(cache.get_many(month_keys), {})
+
+
+@skipIf(TO_BMI_MODEL is None, "absence model is not available")
+class PredictBatchTests(TestCase):
+    """ predict_batch must agree with the single-row log_absence_view path. """
+
+    def setUp(self):
+        cache.clear()
+        for code, description in [(23, "Medical consultation"), (28, "Dental consultation")]:
+            AbsenceReason.objects.create(reason_code=code, description=description)
+        make_employee(1)
+        emp = make_employee(2)
+        emp.age, emp.body_mass_index, emp.service_time = 48, 31.0, 18
+        emp.save()
+
+    def test_matches_single_row_predictions(self):
+        employee_ids, reason_codes = [1, 2, 1], [23, 28, 28]
+        batch = predict_batch(employee_ids, reason_codes)
+        self.assertEqual(len(batch), len(employee_ids))
+
+        for employee_id, reason_code, batch_hours in zip(employee_ids, reason_codes, batch):
+            response = self.client.post(
+                reverse('log_absence'),
+                {'employee_id': employee_id, 'reason_code': reason_code},
+            )
+            result = response.context['prediction_result']
+            self.assertIsNotNone(result)
+            self.assertEqual(result['hours'], round(float(batch_hours), 2))
+
+    def test_rejects_mismatched_lengths(self):
+        with self.assertRaises(ValueError):
+            predict_batch([1, 2], [23])
+
+    def test_accepts_reason_missing_from_cached_list(self):
+        predict_batch([1], [23])  # caches the reason list
+        AbsenceReason.objects.bulk_create([AbsenceReason(reason_code=27, description="Physiotherapy")])
+
+        self.assertEqual(len(predict_batch([1], [27])), 1)
+        response = self.client.post(reverse('log_absence'), {'employee_id': 1, 'reason_code': 27})
+        self.assertIsNotNone(response.context['prediction_result'])
+
+    def test_rejects_unknown_reason(self):
+        with self.assertRaises(AbsenceReason.DoesNotExist):
+            predict_batch([1], [99])
+
+
+class LogAbsencesTests(TestCase):
+    """ log_absences bypasses post_save, so it must drop the cached aggregates itself. """
+
+    def test_inserts_rows_and_drops_month_keys(self):
+        cache.clear()
+        reason = AbsenceReason.objects.create(reason_code=23, description="Medical consultation")
+        make_employee(1)
+        make_employee(2)
+        stale_keys = [
+            monthly_hours_key(2024, 3), monthly_totals_key(2024, 3),
+            monthly_hours_key(2024, 4), monthly_totals_key(2024, 4),
+        ]
+        untouched_key = monthly_totals_key(2024, 5)
+        cache.set_many({key: "stale" for key in [*stale_keys, untouched_key]})
+
+        logs = log_absences([
+            {'employee_id': 1, 'reason': reason, 'predicted_hours': 4.0, 'date_logged': datetime.date(2024, 3, 5)},
+            {'employee_id': 2, 'reason': reason, 'predicted_hours': 2.5, 'date_logged': datetime.date(2024, 4, 9)},
+        ])
 
-# Create your tests here.
+        self.assertEqual(len(logs), 2)
+        self.assertEqual(AbsenceLog.objects.count(), 2)
+        self.assertEqual(cache.get_many(stale_keys), {})
+        self.assertEqual(cache.get(untouched_key), "stale")
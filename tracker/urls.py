@@ -6,6 +6,8 @@ from . import views
 urlpatterns = [
     # Tab 1: Landing Dashboard
     path('', views.dashboard_view, name='dashboard'),
+    # Full list of current absences (paginated, linked from the dashboard)
+    path('absences/', views.current_absences_view, name='current_absences'),
 
     # Tab 2: Log New Absence
     path('log_absence/', views.log_absence_view, name='log_absence'),
@@ -1,12 +1,28 @@
 # tracker/views.py
 
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import Paginator
 from django.shortcuts import render, redirect
-from django.db.models import Count, Sum
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Sum
 from django.utils import timezone
+from .caching import (
+    MONTHLY_HOURS_TIMEOUT,
+    get_all_employees,
+    get_all_reasons,
+    get_employee_count,
+    get_reason_chart,
+    monthly_hours_key,
+    monthly_totals_key,
+)
 from .models import Employee, AbsenceReason, AbsenceLog
 import joblib
-import pandas as pd
-import json
+import numpy as np
+import logging
+import os
+
+logger = logging.getLogger(__name__)
 
 # Recommendations aligned to REASON_MAP codes (import_data.py)
 REASON_RECOMMENDATIONS = {
@@ -55,66 +71,220 @@ except Exception as e:
     print(f"--- ERROR loading model: {e} ---")
     TO_BMI_MODEL = None
 
-# --- Tab 1: Dashboard View (No Change) ---
-def dashboard_view(request):
-    current_absences = AbsenceLog.objects.filter(status='ABSENT').order_by('-date_logged')
+def resolve_predict(model):
+    """Return the cheapest callable that gives `model`'s predictions.
+
+    ExponentiatedGradient draws one of its predictors_ per row, weighted by
+    weights_. When all the weight sits on one predictor that draw is
+    deterministic, so we call that predictor directly and skip fairlearn's
+    per-row DataFrame and random choice (~8x faster on a single row).
+    """
+    weights = np.asarray(getattr(model, 'weights_', ()), dtype=np.float64)
+    chosen = np.flatnonzero(weights)
+    if len(chosen) == 1:
+        return model.predictors_.iloc[chosen[0]].predict
+    return model.predict
+
+MODEL_PREDICT = resolve_predict(TO_BMI_MODEL) if TO_BMI_MODEL is not None else None
+
+# Feature order the inner model was trained on.
+# This contains ONLY those features: NO 'Education', NO 'bmi_cat'.
+FEATURE_COLUMNS = (
+    'Reason for absence',
+    'Month of absence',
+    'Day of the week',
+    'Seasons',
+    'Transportation expense',
+    'Distance from Residence to Work',
+    'Service time',
+    'Age',
+    'Work load Average/day ',
+    'Hit target',
+    'Body mass index',
+)
+
+def check_feature_order(model):
+    """Fail at load time if the model was trained on a different column order.
+
+    The model is fed a bare ndarray (see build_feature_matrix), so xgboost
+    can no longer match columns by name; a retrained model with reordered
+    features would otherwise predict from the wrong inputs without error.
+    """
+    for predictor in getattr(model, 'predictors_', ()):
+        trained_on = getattr(predictor, 'feature_names_in_', None)
+        if trained_on is not None and tuple(trained_on) != FEATURE_COLUMNS:
+            raise ImproperlyConfigured(
+                f"Model features {list(trained_on)} do not match FEATURE_COLUMNS {list(FEATURE_COLUMNS)}."
+            )
+
+if TO_BMI_MODEL is not None:
+    check_feature_order(TO_BMI_MODEL)
+
+def build_feature_matrix(rows):
+    """Stack feature rows (values in FEATURE_COLUMNS order) as the model input.
+
+    The model accepts a plain float64 array, so no DataFrame is built:
+    pandas index/block construction was about half of a single-row predict.
+    """
+    return np.asarray(rows, dtype=np.float64)
+
+# Employee columns that feed the model (see build_feature_row)
+EMPLOYEE_FEATURE_FIELDS = (
+    'transportation_expense',
+    'distance_from_residence_to_work',
+    'service_time',
+    'age',
+    'work_load_average_day',
+    'hit_target',
+    'body_mass_index',
+)
+
+def build_feature_row(employee, reason_code, now):
+    """Return one model input row for `employee`, in FEATURE_COLUMNS order."""
+    month = now.month
+    return (
+        reason_code,
+        month,
+        now.isoweekday() + 1, # Mon=2, Tue=3...
+        (month % 12 + 3) // 3, # Simple season logic
+        employee.transportation_expense,
+        employee.distance_from_residence_to_work,
+        employee.service_time,
+        employee.age,
+        employee.work_load_average_day,
+        employee.hit_target,
+        employee.body_mass_index,
+    )
+
+def predict_batch(employee_ids, reason_codes):
+    """Predict absence hours for many (employee, reason) pairs at once.
+
+    All employees are fetched in one query and every row goes through a
+    single predict() call. Returns an array aligned with the input pairs.
+    """
+    if TO_BMI_MODEL is None:
+        raise RuntimeError("Absence model is not loaded.")
+    if len(employee_ids) != len(reason_codes):
+        raise ValueError(
+            f"Got {len(employee_ids)} employee ids but {len(reason_codes)} reason codes."
+        )
+    if not employee_ids:
+        return np.empty(0)
+
+    known_reasons = {reason.reason_code for reason in get_all_reasons()}
+    unknown = set(reason_codes) - known_reasons
+    if unknown:
+        # Codes missing from the cached list may have just been added
+        unknown -= set(AbsenceReason.objects.filter(pk__in=unknown).values_list('pk', flat=True))
+    if unknown:
+        raise AbsenceReason.DoesNotExist(f"Unknown reason code(s): {sorted(unknown)}")
+
+    employees = Employee.objects.only(*EMPLOYEE_FEATURE_FIELDS).in_bulk(set(employee_ids))
+    missing = set(employee_ids) - employees.keys()
+    if missing:
+        raise Employee.DoesNotExist(f"Unknown employee id(s): {sorted(missing)}")
+
+    now = timezone.now()
+    rows = [
+        build_feature_row(employees[employee_id], reason_code, now)
+        for employee_id, reason_code in zip(employee_ids, reason_codes, strict=True)
+    ]
+    return MODEL_PREDICT(build_feature_matrix(rows))
+
+# Warm-up: run one throwaway prediction at startup so lazy initialisation
+# inside fairlearn/xgboost is paid here, not by the first user request.
+# Set WARMUP=0 (e.g. in tests) to skip it.
+WARMUP_FEATURES = (23, 1, 2, 1, 200, 20, 10, 35, 250.0, 95, 25.0)
+if TO_BMI_MODEL is not None and os.environ.get('WARMUP', '1') == '1':
+    try:
+        MODEL_PREDICT(build_feature_matrix([WARMUP_FEATURES]))
+    except Exception as e:
+        print(f"--- WARNING: model warm-up failed: {e} ---")
+
+def month_bounds(now):
+    """First day of `now`'s month and of the next one, for date range filters.
+
+    A range on date_logged can use its index; __month/__year lookups wrap
+    the column in EXTRACT() and force a full scan.
+    """
+    month_start = now.date().replace(day=1)
+    return month_start, month_start + relativedelta(months=1)
+
+# Rows shown on the dashboard table and per page of the full absence list
+ABSENCES_PER_PAGE = 50
 
-    # Aggregate total hours by reason (all time) with reason code + description
-    reason_query = (
+def current_absences_queryset():
+    """ABSENT logs, newest first, with only the columns the tables render."""
+    return (
         AbsenceLog.objects
-        .values('reason__reason_code', 'reason__description')
-        .annotate(total_hours=Sum('predicted_hours'))
-        .filter(total_hours__gt=0)
-        .order_by('-total_hours')
+        .filter(status='ABSENT')
+        .select_related('employee', 'reason')
+        .only('date_logged', 'predicted_hours', 'status', 'employee__full_name', 'reason__description')
+        .order_by('-date_logged', '-id')
     )
 
-    chart_labels = [item['reason__description'] for item in reason_query]
-    chart_values = [item['total_hours'] for item in reason_query]
+# --- Tab 1: Dashboard View (No Change) ---
+def dashboard_view(request):
+    # Newest ABSENT rows only; one extra row tells us whether to link to
+    # the full paginated list
+    current_absences = list(current_absences_queryset()[:ABSENCES_PER_PAGE + 1])
+    more_absences = len(current_absences) > ABSENCES_PER_PAGE
+    current_absences = current_absences[:ABSENCES_PER_PAGE]
+
+    # Total hours by reason (all time), cached between AbsenceLog writes
+    reason_codes, chart_labels, chart_values = get_reason_chart()
 
     # Determine the top reason and map to recommendation
-    if reason_query:
-        top = reason_query[0]
-        top_reason_code = top['reason__reason_code']
-        top_reason_label = top['reason__description']
+    if reason_codes:
+        top_reason_code = reason_codes[0]
+        top_reason_label = chart_labels[0]
         top_reason_recommendation = REASON_RECOMMENDATIONS.get(top_reason_code, DEFAULT_RECOMMENDATION)
     else:
         top_reason_label = None
         top_reason_recommendation = DEFAULT_RECOMMENDATION
 
     # --- KPI CARDS (Current Month) ---
-    current_month = timezone.now().month
-    current_year = timezone.now().year
-
-    month_logs = (
-        AbsenceLog.objects
-        .filter(date_logged__month=current_month, date_logged__year=current_year)
-        .select_related('employee')
+    now = timezone.now()
+    current_month = now.month
+    current_year = now.year
+    month_start, next_month_start = month_bounds(now)
+
+    # Total hours and estimated compensation reduction
+    # (sum of predicted_hours * hourly_rate) in one aggregate query,
+    # cached until an AbsenceLog in this month is saved or deleted
+    month_totals = cache.get_or_set(
+        monthly_totals_key(current_year, current_month),
+        lambda: (
+            AbsenceLog.objects
+            .filter(date_logged__gte=month_start, date_logged__lt=next_month_start)
+            .aggregate(
+                total=Sum('predicted_hours', default=0.0),
+                impact=Sum(ExpressionWrapper(
+                    F('predicted_hours') * F('employee__hourly_rate'),
+                    output_field=FloatField(),
+                ), default=0.0),
+            )
+        ),
+        MONTHLY_HOURS_TIMEOUT,
     )
-
-    total_predicted_hours = month_logs.aggregate(total=Sum('predicted_hours'))['total'] or 0.0
+    total_predicted_hours = month_totals['total']
+    estimated_compensation_impact = float(month_totals['impact'])
 
     # Absenteeism rate = total predicted hours / (employees * 160) * 100
     STANDARD_WORK_HOURS = 160.0
-    employee_count = Employee.objects.count()
+    employee_count = get_employee_count()
     total_standard_hours = employee_count * STANDARD_WORK_HOURS
     if total_standard_hours > 0:
         absenteeism_rate = (float(total_predicted_hours) / float(total_standard_hours)) * 100.0
     else:
         absenteeism_rate = 0.0
 
-    # Estimated compensation reduction = sum(predicted_hours * hourly_rate) across month logs
-    estimated_compensation_impact = 0.0
-    for log in month_logs:
-        try:
-            estimated_compensation_impact += float(log.predicted_hours) * float(log.employee.hourly_rate)
-        except Exception:
-            # In case of missing employee/hourly_rate, skip that log
-            continue
-
     context = {
         'current_absences': current_absences,
-        'chart_labels': json.dumps(chart_labels),
-        'chart_data': json.dumps(chart_values),
+        'more_absences': more_absences,
+        # Raw lists; the template serializes them once with json_script
+        'chart_labels': chart_labels,
+        'chart_data': chart_values,
         'top_reason_label': top_reason_label,
         'top_reason_recommendation': top_reason_recommendation,
         # KPI cards
@@ -125,11 +295,20 @@ def dashboard_view(request):
     }
     return render(request, 'tracker/1_dashboard.html', context)
 
+def current_absences_view(request):
+    """Every currently absent employee, paginated (linked from the dashboard)."""
+    page_obj = Paginator(current_absences_queryset(), ABSENCES_PER_PAGE).get_page(request.GET.get('page'))
+    context = {
+        'page_obj': page_obj,
+        'page': 'dashboard'
+    }
+    return render(request, 'tracker/6_current_absences.html', context)
+
 # --- Tab 2: Log Absence View (THE FINAL FIX) ---
 def log_absence_view(request):
     context = {
-        'employees': Employee.objects.all(),
-        'reasons': AbsenceReason.objects.all(),
+        'employees': get_all_employees(),
+        'reasons': get_all_reasons(),
         'prediction_result': None,
         'page': 'log_absence'
     }
@@ -140,59 +319,36 @@ def log_absence_view(request):
             employee_id = int(request.POST.get('employee_id'))
             reason_code = int(request.POST.get('reason_code'))
             
-            # 2. Get the full employee object from DB
-            employee = Employee.objects.get(employee_id=employee_id)
-            reason = AbsenceReason.objects.get(reason_code=reason_code)
-            
-            # 3. Build the feature dictionary (X)
-            # This contains ONLY the features your inner model was trained on.
-            # NO 'Education', NO 'bmi_cat'.
-            feature_dict = {
-                'Reason for absence': reason_code,
-                'Month of absence': timezone.now().month,
-                'Day of the week': timezone.now().isoweekday() + 1, # Mon=2, Tue=3...
-                'Seasons': (timezone.now().month%12 + 3)//3, # Simple season logic
-                'Transportation expense': employee.transportation_expense,
-                'Distance from Residence to Work': employee.distance_from_residence_to_work,
-                'Service time': employee.service_time,
-                'Age': employee.age,
-                'Work load Average/day ': employee.work_load_average_day, 
-                'Hit target': employee.hit_target,
-                'Body mass index': employee.body_mass_index,
-            }
-
-            # 4. Create the main DataFrame (X)
-            X_pred = pd.DataFrame([feature_dict])
-
-            # 5. Create the SEPARATE sensitive_features Series
-            # We get the employee's BMI and categorize it, just as in Colab.
-            bins = [0, 18.5, 25, 30, 100]
-            labels = ['underweight', 'normal weight', 'over weight', 'obese']
+            # 2. Validate the reason against the cached reason list (checking
+            # the DB on a miss, in case the reason was just added), then get
+            # only the employee columns the model needs from DB (one query).
+            if not (
+                any(reason.reason_code == reason_code for reason in context['reasons'])
+                or AbsenceReason.objects.filter(pk=reason_code).exists()
+            ):
+                raise AbsenceReason.DoesNotExist(f"Unknown reason code {reason_code}")
+            employee = Employee.objects.only(
+                'full_name', *EMPLOYEE_FEATURE_FIELDS
+            ).get(employee_id=employee_id)
             
-            # Create a pandas Series, not a DataFrame column
-            sensitive_features_series = pd.cut(
-                [employee.body_mass_index], # Pass BMI as a list
-                bins=bins, 
-                labels=labels, 
-                right=False
-            )
-            
-            # tracker/views.py
+            # 3. Build the feature row (X) in FEATURE_COLUMNS order
+            feature_row = build_feature_row(employee, reason_code, timezone.now())
 
-# ... (inside log_absence_view) ...
+            # 4. Create the model input (X)
+            X_pred = build_feature_matrix([feature_row])
 
-            # 6. Make prediction
-            predicted_hours = TO_BMI_MODEL.predict(
+            # 5. Make prediction
+            predicted_hours = MODEL_PREDICT(
                 X_pred
             )[0]
 
             predicted_hours =  round(float(predicted_hours), 2) # Round to 2 decimal places
 
             if predicted_hours > 0:
-                # 7. Save to AbsenceLog (ONLY if > 0)
+                # 6. Save to AbsenceLog (ONLY if > 0)
                 AbsenceLog.objects.create(
                     employee=employee,
-                    reason=reason,
+                    reason_id=reason_code,
                     predicted_hours=predicted_hours,
                     status='ABSENT'
                 )
@@ -208,49 +364,70 @@ def log_absence_view(request):
                     'name': employee.full_name,
                 }
 
-        except Exception as e:
+        except (Employee.DoesNotExist, AbsenceReason.DoesNotExist, TypeError, ValueError) as e:
+            # Bad form input (missing/non-numeric ids, unknown employee or reason).
+            # Anything else is a real bug and goes to Django's 500 handling.
             context['error'] = f"Prediction failed: {e}. Check terminal for details."
-            print(f"--- PREDICTION ERROR: {e} ---")
+            logger.exception("Prediction failed")
 
     return render(request, 'tracker/2_log_absence.html', context)
 
 # --- Tab 3: Salaries View (No Change) ---
 def salaries_view(request):
     STANDARD_WORK_HOURS = 160.0
-    employees = Employee.objects.all()
-    salary_data = []
+    employees = list(Employee.objects.values_list('employee_id', 'full_name', 'hourly_rate'))
     
-    current_month = timezone.now().month
-    current_year = timezone.now().year
+    now = timezone.now()
+    current_month = now.month
+    current_year = now.year
+    month_start, next_month_start = month_bounds(now)
+
+    # Monthly absent hours for every employee in one GROUP BY query,
+    # cached until an AbsenceLog in this month is saved or deleted
+    hours_by_employee = cache.get_or_set(
+        monthly_hours_key(current_year, current_month),
+        lambda: dict(
+            AbsenceLog.objects
+            .filter(date_logged__gte=month_start, date_logged__lt=next_month_start)
+            .values_list('employee_id')
+            .annotate(total_hours=Sum('predicted_hours'))
+        ),
+        MONTHLY_HOURS_TIMEOUT,
+    )
+
+    # Individual calculations, vectorized over all employees
+    hours = np.fromiter(
+        (hours_by_employee.get(employee_id) or 0.0 for employee_id, _, _ in employees),
+        dtype=np.float64, count=len(employees),
+    )
+    rates = np.fromiter(
+        (float(hourly_rate) for _, _, hourly_rate in employees),
+        dtype=np.float64, count=len(employees),
+    )
+    expected_work_hours = np.maximum(0.0, STANDARD_WORK_HOURS - hours)
+    absence_cost = hours * rates
+    expected_compensation = expected_work_hours * rates
+
+    salary_data = [
+        {
+            'name': full_name,
+            'total_absent_hours': emp_hours, # Pass the full float
+            'expected_work_hours': round(emp_expected_hours, 1),
+            'absence_cost': round(emp_cost, 2),
+            'expected_compensation': round(emp_compensation, 2)
+        }
+        for (_, full_name, _), emp_hours, emp_expected_hours, emp_cost, emp_compensation in zip(
+            employees,
+            hours.tolist(),
+            expected_work_hours.tolist(),
+            absence_cost.tolist(),
+            expected_compensation.tolist(),
+        )
+    ]
 
     # Company-wide totals
-    total_company_hours_lost = 0.0
-    total_company_cost_impact = 0.0
-
-    for emp in employees:
-        absent_hours_agg = AbsenceLog.objects.filter(
-            employee=emp,
-            date_logged__month=current_month,
-            date_logged__year=current_year
-        ).aggregate(total_hours=Sum('predicted_hours'))
-        
-        total_absent_hours = absent_hours_agg['total_hours'] or 0.0
-        # Individual calculations
-        expected_work_hours = max(0, STANDARD_WORK_HOURS - float(total_absent_hours))
-        absence_cost = float(total_absent_hours) * float(emp.hourly_rate)
-        expected_compensation = expected_work_hours * float(emp.hourly_rate)
-
-        # Update company-wide totals
-        total_company_hours_lost += float(total_absent_hours)
-        total_company_cost_impact += absence_cost
-        
-        salary_data.append({
-            'name': emp.full_name,
-            'total_absent_hours': total_absent_hours, # Pass the full float
-            'expected_work_hours': round(expected_work_hours, 1),
-            'absence_cost': round(absence_cost, 2),
-            'expected_compensation': round(expected_compensation, 2)
-        })
+    total_company_hours_lost = float(hours.sum())
+    total_company_cost_impact = float(absence_cost.sum())
 
     context = {
         'salary_data': salary_data,